@@ -32,54 +32,6 @@ parent_dir = Path(__file__).parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-# Load environment variables
-load_dotenv()
-
-# Environment configuration (same as guards_demo_ui.py)
-os.environ['SPACY_WARNING_IGNORE'] = 'W008'
-os.environ['TRANSFORMERS_OFFLINE'] = '1'
-os.environ['TOKENIZERS_PARALLELISM'] = 'false'
-os.environ['TORCH_COMPILE_DISABLE'] = '1'
-os.environ['PYTORCH_JIT'] = '0'
-safe_print("🔧 Configured environment for compatibility")
-
-# HuggingFace configuration
-if not os.getenv('HF_HOME'):
-    os.environ['HF_HOME'] = '/tmp/.cache/huggingface'
-    safe_print(f"📂 Set HF_HOME to: {os.environ['HF_HOME']}")
-
-hf_token = os.getenv('HF_TOKEN')
-if hf_token:
-    os.environ['HF_TOKEN'] = hf_token
-    os.environ['HUGGING_FACE_HUB_TOKEN'] = hf_token
-    safe_print(f"🔑 HF_TOKEN configured")
-
-cache_dir = os.environ.get('HF_HOME', '/tmp/.cache/huggingface')
-os.makedirs(cache_dir, exist_ok=True)
-
-# Additional transformers configuration
-os.environ['TRANSFORMERS_OFFLINE'] = '0'
-os.environ['TRANSFORMERS_NO_TF'] = '1'
-os.environ['TRANSFORMERS_VERBOSITY'] = 'error'
-os.environ['HF_HUB_DISABLE_EXPERIMENTAL_WARNING'] = '1'
-os.environ['HF_HUB_DISABLE_IMPLICIT_TOKEN'] = '0'
-
-# Torch configuration
-try:
-    import torch
-    torch.jit._state.disable()
-    if hasattr(torch, '_dynamo'):
-        torch._dynamo.config.suppress_errors = True
-        torch._dynamo.config.cache_size_limit = 0
-    if hasattr(torch, 'autograd'):
-        torch.autograd.set_grad_enabled(False)
-        torch.autograd.profiler.profile(enabled=False)
-    safe_print("🔧 Torch configured")
-except ImportError:
-    pass
-except Exception as e:
-    safe_print(f"⚠️ Could not configure torch: {e}")
-
 # Page configuration
 st.set_page_config(
     page_title="Omniguard - AI Agent Guards",
@@ -88,11 +40,68 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Import page modules (after environment setup)
-safe_print(f"📦 Importing page modules... ({time.time() - start_time:.2f}s)")
-from multi_agent_demo.page_modules import realtime_page, deviations_page
-from multi_agent_demo.ui.common import render_agent_configuration
-safe_print(f"✅ Page modules imported ({time.time() - start_time:.2f}s)")
+
+# Streamlit re-executes this script on every rerun, so the environment
+# setup below used to repeat its dotenv read, getenv probes, makedirs and
+# torch configuration on each widget interaction. cache_resource runs the
+# whole block once per process.
+@st.cache_resource(show_spinner=False)
+def _configure_environment() -> bool:
+    # Load environment variables
+    load_dotenv()
+
+    # Environment configuration (same as guards_demo_ui.py)
+    os.environ['SPACY_WARNING_IGNORE'] = 'W008'
+    os.environ['TRANSFORMERS_OFFLINE'] = '1'
+    os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+    os.environ['TORCH_COMPILE_DISABLE'] = '1'
+    os.environ['PYTORCH_JIT'] = '0'
+    safe_print("🔧 Configured environment for compatibility")
+
+    # HuggingFace configuration
+    if not os.getenv('HF_HOME'):
+        os.environ['HF_HOME'] = '/tmp/.cache/huggingface'
+        safe_print(f"📂 Set HF_HOME to: {os.environ['HF_HOME']}")
+
+    hf_token = os.getenv('HF_TOKEN')
+    if hf_token:
+        os.environ['HF_TOKEN'] = hf_token
+        os.environ['HUGGING_FACE_HUB_TOKEN'] = hf_token
+        safe_print(f"🔑 HF_TOKEN configured")
+
+    cache_dir = os.environ.get('HF_HOME', '/tmp/.cache/huggingface')
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # Additional transformers configuration
+    os.environ['TRANSFORMERS_OFFLINE'] = '0'
+    os.environ['TRANSFORMERS_NO_TF'] = '1'
+    os.environ['TRANSFORMERS_VERBOSITY'] = 'error'
+    os.environ['HF_HUB_DISABLE_EXPERIMENTAL_WARNING'] = '1'
+    os.environ['HF_HUB_DISABLE_IMPLICIT_TOKEN'] = '0'
+
+    # Torch configuration
+    try:
+        import torch
+        torch.jit._state.disable()
+        if hasattr(torch, '_dynamo'):
+            torch._dynamo.config.suppress_errors = True
+            torch._dynamo.config.cache_size_limit = 0
+        if hasattr(torch, 'autograd'):
+            torch.autograd.set_grad_enabled(False)
+            torch.autograd.profiler.profile(enabled=False)
+        safe_print("🔧 Torch configured")
+    except ImportError:
+        pass
+    except Exception as e:
+        safe_print(f"⚠️ Could not configure torch: {e}")
+
+    return True
+
+
+_configure_environment()
+
+# Page modules are imported lazily in main() so cold start only pays the
+# import cost of the page actually being rendered
 
 
 def initialize_session_state():
@@ -188,10 +197,13 @@ def main():
     # Render page navigation
     render_page_navigation()
 
-    # Render selected page
+    # Render selected page (imported here so only the active page's
+    # dependency chain loads; repeat imports hit sys.modules and are free)
     if st.session_state.current_page == "Real-Time":
+        from multi_agent_demo.page_modules import realtime_page
         realtime_page.render()
     elif st.session_state.current_page == "Deviation":
+        from multi_agent_demo.page_modules import deviations_page
         deviations_page.render()
 
 
@@ -3,17 +3,15 @@ Firewall integration and scanner orchestration
 """
 
 import streamlit as st
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict
 
 from llamafirewall import (
-    AssistantMessage,
     LlamaFirewall,
     Role,
     ScannerType,
     ScanDecision,
-    Trace,
     UserMessage,
 )
 
@@ -29,6 +27,36 @@ from multi_agent_demo.direct_scanner_wrapper import (
 )
 
 
+@st.cache_resource(show_spinner=False)
+def _scan_executor() -> ThreadPoolExecutor:
+    """
+    Shared thread pool for blocking scanner I/O.
+
+    Scanner calls are remote HTTP requests; running them through one
+    process-wide executor overlaps the I/O without spinning up and
+    tearing down a pool on every test run.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="scan")
+
+
+@st.cache_resource(show_spinner=False)
+def _build_firewall(promptguard_enabled: bool, alignment_enabled: bool):
+    """
+    Construct a LlamaFirewall for the given scanner selection.
+
+    cache_resource keeps one instance per selection process-wide, so
+    Streamlit reruns stop reloading PromptGuard model weights and
+    re-running tokenizer init on every widget interaction. The flags are
+    the cache key: toggling a scanner builds (once) a separate instance.
+    """
+    scanner_config = {}
+    if promptguard_enabled:
+        scanner_config[Role.USER] = [ScannerType.PROMPT_GUARD]
+    if alignment_enabled:
+        scanner_config[Role.ASSISTANT] = [ScannerType.AGENT_ALIGNMENT]
+    return LlamaFirewall(scanner_config)
+
+
 def initialize_firewall():
     """
     Initialize LlamaFirewall with selected LlamaFirewall scanners only.
@@ -94,8 +122,11 @@ def initialize_firewall():
         print(f"🚀 Initializing LlamaFirewall with scanners: {llamafirewall_names}")
         print(f"🔧 Scanner config: {scanner_config}")
 
-        # Initialize with explicit configuration
-        firewall = LlamaFirewall(scanner_config)
+        # Fetch the cached instance for this selection (built on first use)
+        firewall = _build_firewall(
+            enabled_scanners.get("PromptGuard", False),
+            enabled_scanners.get("AlignmentCheck", False)
+        )
 
         print(f"✅ LlamaFirewall initialized with {len(llamafirewall_names)} scanner(s): {llamafirewall_names}")
         return firewall
@@ -127,30 +158,25 @@ def initialize_nemo_scanners():
     return scanners
 
 
-def build_trace(purpose: str, messages: List[Dict]) -> Trace:
-    """Build LlamaFirewall trace from conversation"""
-    trace = []
-
-    # Add purpose as first message if provided
-    if purpose:
-        trace.append(UserMessage(content=f"My goal is: {purpose}"))
-
-    for msg in messages:
-        if msg["type"] == "user":
-            trace.append(UserMessage(content=msg["content"]))
-        elif msg["type"] == "assistant":
-            if msg.get("action"):
-                # Format as action
-                formatted = json.dumps({
-                    "thought": msg["content"],
-                    "action": msg["action"],
-                    "action_input": msg.get("action_input", {})
-                })
-                trace.append(AssistantMessage(content=formatted))
-            else:
-                trace.append(AssistantMessage(content=msg["content"]))
+# AlignmentCheck cost grows with prompt tokens: the direct scanner
+# serializes every conversation turn into its prompt, so very long
+# conversations are trimmed before the scan — beyond the threshold only
+# the last TRACE_KEEP_LAST turns go through verbatim and the older ones
+# collapse into a single marker message
+TRACE_TURN_THRESHOLD = 30
+TRACE_KEEP_LAST = 20
+
 
-    return trace
+def _trim_conversation_for_alignment(messages: List[Dict]) -> List[Dict]:
+    """Bound the message list sent to the AlignmentCheck scan"""
+    if len(messages) <= TRACE_TURN_THRESHOLD:
+        return messages
+    omitted = len(messages) - TRACE_KEEP_LAST
+    marker = {
+        "type": "assistant",
+        "content": f"... [{omitted} earlier conversation turns omitted to bound the scan] ..."
+    }
+    return [marker] + messages[-TRACE_KEEP_LAST:]
 
 
 def test_prompt_guard(firewall, user_input: str) -> Dict:
@@ -175,30 +201,60 @@ def test_prompt_guard(firewall, user_input: str) -> Dict:
         return scan_prompt_guard_direct(user_input)
 
 
-def test_alignment_check(firewall, trace: Trace, messages: List[Dict] = None, purpose: str = "") -> Dict:
-    """Test AlignmentCheck scanner on conversation trace with fallback to direct API"""
-    try:
-        result = firewall.scan_replay(trace)
+def test_prompt_guard_batch(firewall, user_inputs: List[str]) -> List[Dict]:
+    """
+    Test PromptGuard on several user messages in one batch.
 
-        return {
-            "scanner": "AlignmentCheck",
-            "decision": str(result.decision),
-            "score": result.score,
-            "reason": result.reason,
-            "is_safe": result.decision == ScanDecision.ALLOW
-        }
-    except SyntaxError as e:
-        # Syntax error - try direct API fallback
-        print(f"⚠️ LlamaFirewall AlignmentCheck failed with SyntaxError, trying direct API fallback...")
-        if messages is not None:
-            return scan_alignment_check_direct(messages, purpose)
-        return {"error": f"SyntaxError and no messages for fallback: {str(e)}", "scanner": "AlignmentCheck"}
+    A multi-message trace previously paid one full scan (tokenization +
+    model forward pass) per message, strictly serially. When LlamaFirewall
+    exposes a bulk entry point the whole batch goes through a single call;
+    otherwise the per-message scans run concurrently in a thread pool.
+    Results come back in input order.
+    """
+    messages = [UserMessage(content=text) for text in user_inputs]
+    try:
+        print(f"🔍 Testing PromptGuard on batch of {len(messages)} message(s)...")
+        if hasattr(firewall, "scan_many"):
+            raw_results = firewall.scan_many(messages)
+        else:
+            raw_results = list(_scan_executor().map(firewall.scan, messages))
+
+        return [
+            {
+                "scanner": "PromptGuard",
+                "decision": str(result.decision),
+                "score": result.score,
+                "reason": result.reason,
+                "is_safe": result.decision == ScanDecision.ALLOW
+            }
+            for result in raw_results
+        ]
     except Exception as e:
-        # Other errors - try direct API fallback if available
-        print(f"⚠️ LlamaFirewall AlignmentCheck failed: {str(e)}, trying direct API fallback...")
-        if messages is not None:
-            return scan_alignment_check_direct(messages, purpose)
-        return {"error": str(e), "scanner": "AlignmentCheck"}
+        # Try direct HF Inference API fallback per message
+        print(f"⚠️ Batched PromptGuard scan failed: {str(e)}, trying direct API fallback...")
+        return [scan_prompt_guard_direct(text) for text in user_inputs]
+
+
+# Memoized scan wrappers: Streamlit reruns the script on every widget
+# interaction, and re-running tests over an unchanged conversation was
+# re-invoking the remote models. cache_data keys on the message content
+# (and purpose), so only genuinely new inputs reach the scanners. The
+# firewall argument is underscore-prefixed to keep the unhashable instance
+# out of the cache key.
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_prompt_guard_batch(_firewall, user_inputs: tuple) -> List[Dict]:
+    return test_prompt_guard_batch(_firewall, list(user_inputs))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_prompt_guard_direct(user_inputs: tuple) -> List[Dict]:
+    return [scan_prompt_guard_direct(text) for text in user_inputs]
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _cached_alignment_check_direct(messages: List[Dict], purpose: str) -> Dict:
+    return scan_alignment_check_direct(messages, purpose)
 
 
 def run_scanner_tests():
@@ -208,38 +264,46 @@ def run_scanner_tests():
     BUG FIX: This function now properly handles the case where only NeMo scanners
     are enabled (firewall is None but tests should still run).
     """
-    # Get firewall (may be None if only NeMo scanners enabled)
-    firewall = initialize_firewall()
+    enabled_scanners = st.session_state.enabled_scanners
+
+    # Get firewall (may be None if only NeMo scanners enabled); skip the
+    # initialization path entirely when no LlamaFirewall scanner is selected
+    llamafirewall_needed = any(
+        enabled_scanners.get(name, False) for name in ("PromptGuard", "AlignmentCheck")
+    )
+    firewall = initialize_firewall() if llamafirewall_needed else None
 
     # BUG FIX: Check if ANY scanner is enabled, not just if firewall exists
-    enabled_scanners = st.session_state.enabled_scanners
     any_scanner_enabled = any(enabled_scanners.values())
 
     if not any_scanner_enabled:
         st.error("❌ No scanners available. Please enable at least one scanner in the sidebar.")
         return
 
-    # Build trace
-    trace = build_trace(
-        st.session_state.current_conversation["purpose"],
-        st.session_state.current_conversation["messages"]
-    )
-
     # Test enabled scanners
     alignment_result = None
     promptguard_results = []
     nemo_results = {}
 
+    # Stream verdicts as each scanner finishes instead of leaving the user
+    # on a spinner until the slowest one (usually AlignmentCheck) returns
+    progress = st.status("Running scanners...", expanded=True)
+
     # Test AlignmentCheck if enabled (with fallback to direct API if firewall fails)
     print(f"🔍 AlignmentCheck enabled: {enabled_scanners.get('AlignmentCheck', False)}")
     print(f"🔍 Firewall object: {firewall is not None}")
+    alignment_future = None
     if enabled_scanners.get("AlignmentCheck", False):
         print("✅ Running AlignmentCheck scanner...")
         # ALWAYS use direct API for AlignmentCheck to get our enhanced quantitative detection
         # The firewall's native scan_replay doesn't have our custom prompts
         print("ℹ️ Using direct AlignmentCheck API (with enhanced quantitative detection)")
-        alignment_result = scan_alignment_check_direct(
-            st.session_state.current_conversation["messages"],
+        # Both scanners are network-bound: launch the AlignmentCheck LLM
+        # call in the background so it overlaps the PromptGuard scans and
+        # wall time is the slower of the two instead of their sum
+        alignment_future = _scan_executor().submit(
+            _cached_alignment_check_direct,
+            _trim_conversation_for_alignment(st.session_state.current_conversation["messages"]),
             st.session_state.current_conversation["purpose"]
         )
     else:
@@ -247,16 +311,25 @@ def run_scanner_tests():
 
     # Test PromptGuard if enabled (with fallback to direct API if firewall fails)
     if enabled_scanners.get("PromptGuard", False):
-        for msg in st.session_state.current_conversation["messages"]:
-            if msg["type"] == "user":
-                if firewall is not None:
-                    result = test_prompt_guard(firewall, msg["content"])
-                else:
-                    # No firewall, use direct API
-                    print("ℹ️ Using direct PromptGuard API (no firewall)")
-                    result = scan_prompt_guard_direct(msg["content"])
-                result["message"] = msg["content"][:50] + "..."
+        # Collect the user messages up front and scan them as one batch
+        # instead of one serial firewall.scan per message
+        user_inputs = [
+            msg["content"]
+            for msg in st.session_state.current_conversation["messages"]
+            if msg["type"] == "user"
+        ]
+        if user_inputs:
+            if firewall is not None:
+                results = _cached_prompt_guard_batch(firewall, tuple(user_inputs))
+            else:
+                # No firewall, use direct API
+                print("ℹ️ Using direct PromptGuard API (no firewall)")
+                results = _cached_prompt_guard_direct(tuple(user_inputs))
+            for text, result in zip(user_inputs, results):
+                result["message"] = text[:50] + "..."
                 promptguard_results.append(result)
+                verdict = "✅ safe" if result.get("is_safe") else "🚫 blocked"
+                progress.write(f"PromptGuard · {verdict}: {result['message']}")
 
     # Test NeMo GuardRails and custom scanners if enabled (don't require firewall)
     messages = st.session_state.current_conversation["messages"]
@@ -265,9 +338,20 @@ def run_scanner_tests():
 
     if enabled_scanners.get("FactsChecker", False) and NEMO_GUARDRAILS_AVAILABLE:
         nemo_results["FactsChecker"] = nemo_scanners["FactsChecker"].scan(messages)
+        progress.write("FactsChecker · finished")
 
     if enabled_scanners.get("DataDisclosureGuard", False) and PRESIDIO_AVAILABLE:
         nemo_results["DataDisclosureGuard"] = nemo_scanners["DataDisclosureGuard"].scan(messages, purpose)
+        progress.write("DataDisclosureGuard · finished")
+
+    # Collect the AlignmentCheck result now that the other scanners have
+    # run alongside it
+    if alignment_future is not None:
+        progress.write("AlignmentCheck · waiting for analysis...")
+        alignment_result = alignment_future.result()
+        progress.write("AlignmentCheck · finished")
+
+    progress.update(label="All scanners finished", state="complete", expanded=False)
 
     # Store results
     test_result = {
@@ -7,6 +7,22 @@ import streamlit as st
 from multi_agent_demo.ui import render_sidebar, render_conversation_builder, render_test_results
 from multi_agent_demo.ui.common import render_page_header
 
+# Fragments scope widget-driven reruns to their own panel (typing in the
+# conversation builder no longer re-executes the results column or the
+# sidebar); st.rerun() calls inside the panels still rerun the whole app.
+# Older Streamlit versions without fragments fall back to plain functions
+_fragment = st.fragment if hasattr(st, "fragment") else (lambda func: func)
+
+
+@_fragment
+def _conversation_panel():
+    render_conversation_builder()
+
+
+@_fragment
+def _results_panel():
+    render_test_results()
+
 
 def render():
     """Render the real-time testing page"""
@@ -24,8 +40,8 @@ def render():
 
     with col1:
         # Render conversation builder (left panel)
-        render_conversation_builder()
+        _conversation_panel()
 
     with col2:
         # Render test results (right panel)
-        render_test_results()
+        _results_panel()
@@ -2,17 +2,184 @@
 NeMo GuardRails Scanner Implementations
 """
 
-from typing import List, Dict
+from typing import List, Dict, TypedDict
+import functools
+import importlib.util
+import logging
 import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ScanResult(TypedDict, total=False):
+    """Fixed schema for scanner results.
+
+    Kept a plain dict at runtime because the UI layers consume results via
+    .get(); the TypedDict pins the key set so new fields are added here
+    rather than ad hoc at each return site.
+    """
+    scanner: str
+    decision: str
+    score: float
+    reason: str
+    is_safe: bool
+    claims_detected: List[str]
+    analysis_method: str
+    ai_response: str
+    error: str
+
+# NeMo GuardRails pulls in heavy transitive deps (langchain, pydantic,
+# tokenizers), so only probe for it here and import it on first use
+NEMO_GUARDRAILS_AVAILABLE = importlib.util.find_spec("nemoguardrails") is not None
+if NEMO_GUARDRAILS_AVAILABLE:
+    print("✅ NeMo GuardRails available")
+else:
+    print("⚠️ NeMo GuardRails not available - install with: pip install nemoguardrails")
 
-# NeMo GuardRails imports
-try:
+
+@functools.lru_cache(maxsize=1)
+def _import_nemo():
+    """Import nemoguardrails lazily; cached so the import cost is paid once"""
     from nemoguardrails import LLMRails, RailsConfig
-    NEMO_GUARDRAILS_AVAILABLE = True
-    print("✅ NeMo GuardRails loaded successfully")
+    return LLMRails, RailsConfig
+
+# Optional Aho-Corasick automaton for single-pass keyword scanning
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    NEMO_GUARDRAILS_AVAILABLE = False
-    print("⚠️ NeMo GuardRails not available - install with: pip install nemoguardrails")
+    AHOCORASICK_AVAILABLE = False
+
+# Indicator rules that NeMo found issues, built once at import instead of per scan.
+# Each rule is a tuple of keyword groups: the rule fires when every group has at
+# least one of its alternatives present in the response.
+_FALSE_CLAIM_RULES = (
+    (("inaccuracies",),),
+    (("exaggerations",),),
+    (("misleading",),),
+    (("incorrect",),),
+    (("not supported",),),
+    (("not feasible",),),
+    (("rare for",), ("uniform",)),
+    (("the assertion",), ("not",)),
+    (("the claim",), ("incorrect", "wrong")),
+    # Additional indicators based on actual NeMo responses
+    (("unlikely",), ("highly", "quite")),
+    (("improbable",),),
+    (("not accurate",),),
+    (("unrealistic",),),
+    (("lack a basis in reality",),),
+    (("don't reflect",), ("real-world", "reality")),
+    (("not scientifically validated",),),
+    (("vary widely",), ("unlikely",)),
+    (("claiming that",), ("not accurate",)),
+    # Fabricated statistics and unsourced claims
+    (("fabricated",),),
+    (("made up",),),
+    (("no evidence",),),
+    (("without evidence",),),
+    (("no source",),),
+    (("unsubstantiated",),),
+    (("without citation",),),
+    (("lacks evidence",),),
+    (("no basis",),),
+    (("cannot be verified",),),
+    (("no data",), ("support",)),
+    (("invented",), ("statistic", "number", "percentage")),
+    (("specific percentage",), ("cannot", "no")),
+)
+
+# Specific claims extracted from NeMo's analysis: (label, keyword alternatives)
+_CLAIM_RULES = (
+    ("GDP growth uniformity claim", ("gdp growth",)),
+    ("Cancer cure rate claim", ("100% cure rate", "cancer")),
+    ("Global unemployment rate claim", ("unemployment",)),
+    ("Daily consumption claim", ("water", "2.3 liters")),
+    ("Geographic/population claims", ("coordinates", "population")),
+    ("Historical civilization claim", ("1847", "civilization")),
+)
+
+# Every substring consulted by the false-claim indicator and claim-extraction
+# rules in _nemo_fact_check, derived from the rule tables so each keyword is
+# registered exactly once however many rules reference it. Scanned in one pass
+# so the response text is walked once instead of once per keyword.
+_INDICATOR_KEYWORDS = tuple(sorted(
+    {keyword for rule in _FALSE_CLAIM_RULES for group in rule for keyword in group}
+    | {keyword for _, keywords in _CLAIM_RULES for keyword in keywords}
+))
+
+
+def _matches_false_claim_rules(hits: set) -> bool:
+    """Check the matched keyword set against the rule table, short-circuiting"""
+    return any(
+        all(any(keyword in hits for keyword in group) for group in rule)
+        for rule in _FALSE_CLAIM_RULES
+    )
+
+
+def _build_automaton(keywords):
+    """Build an Aho-Corasick automaton over the given keywords"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_INDICATOR_AUTOMATON = _build_automaton(_INDICATOR_KEYWORDS) if AHOCORASICK_AVAILABLE else None
+
+# Compiled alternation used when pyahocorasick is absent: one pass over the text
+# instead of one scan per keyword. The lookahead makes matches overlapping and
+# longest-first; keywords contained in a longer match are implied afterwards.
+_INDICATOR_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_INDICATOR_KEYWORDS, key=len, reverse=True)) + "))"
+)
+_CONTAINED_KEYWORDS = {
+    keyword: tuple(k for k in _INDICATOR_KEYWORDS if k != keyword and k in keyword)
+    for keyword in _INDICATOR_KEYWORDS
+}
+
+
+def _keyword_hits(text: str) -> set:
+    """Return the set of indicator keywords present in text.
+
+    Uses a single Aho-Corasick pass when pyahocorasick is installed,
+    otherwise a single compiled-alternation regex pass.
+    """
+    if _INDICATOR_AUTOMATON is not None:
+        return {keyword for _, keyword in _INDICATOR_AUTOMATON.iter(text)}
+    hits = set(_INDICATOR_RE.findall(text))
+    for keyword in tuple(hits):
+        hits.update(_CONTAINED_KEYWORDS[keyword])
+    return hits
+
+
+_RAILS_INIT_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_rails(config_path: str):
+    """Build the LLMRails instance once per process and share it.
+
+    Config parsing and Rails construction are the expensive part of
+    FactCheckerScanner setup; the lock guards against concurrent first-time
+    initialization from multiple Streamlit sessions.
+    """
+    LLMRails, RailsConfig = _import_nemo()
+    with _RAILS_INIT_LOCK:
+        return LLMRails(RailsConfig.from_path(config_path))
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_openai_models(api_key: str) -> tuple:
+    """List the OpenAI models the key can access; cached so the network
+    round-trip happens at most once per process, not per scanner instance"""
+    import openai
+    client = openai.OpenAI(api_key=api_key)
+    models = client.models.list()
+    return tuple(model.id for model in models.data)
 
 
 class NemoGuardRailsScanner:
@@ -43,67 +210,74 @@ class FactCheckerScanner(NemoGuardRailsScanner):
                 # Disable NeMo's automatic model downloads
                 os.environ['NEMOGUARDRAILS_DISABLE_MODELS'] = '1'
 
-                print("🔧 FactChecker: Attempting to load NeMo GuardRails config...")
+                logger.debug("FactChecker: Attempting to load NeMo GuardRails config...")
 
                 # Check if config directory exists
                 config_path = "nemo_config/"
                 if not os.path.exists(config_path):
                     raise FileNotFoundError(f"Config directory '{config_path}' not found")
 
-                print(f"📁 Config directory found: {config_path}")
-                print(f"📄 Config files: {os.listdir(config_path)}")
+                logger.debug("Config directory found: %s (files: %s)", config_path, os.listdir(config_path))
 
                 # Check if OPENAI_API_KEY is set
                 openai_key = os.getenv('OPENAI_API_KEY')
                 if not openai_key:
                     raise ValueError("OPENAI_API_KEY environment variable is not set")
-                print(f"🔑 OPENAI_API_KEY found: {openai_key[:15]}...{openai_key[-15:]} (length: {len(openai_key)})")
+                logger.debug("OPENAI_API_KEY found (length: %d)", len(openai_key))
 
                 # Test OpenAI API access to avoid model access issues
+                # (cached module-level probe - the catalog is fetched once per process)
                 try:
-                    import openai
-                    client = openai.OpenAI(api_key=openai_key)
-                    # Try to list available models
-                    models = client.models.list()
-                    available_models = [model.id for model in models.data]
-                    print(f"🤖 Available OpenAI models: {available_models[:5]}...")  # Show first 5
+                    available_models = _probe_openai_models(openai_key)
+                    logger.debug("Available OpenAI models: %s...", available_models[:5])  # Show first 5
 
                     # Check if our preferred models are available
                     preferred_models = ["gpt-4o-mini", "gpt-3.5-turbo-instruct", "gpt-3.5-turbo"]
                     for model in preferred_models:
                         if model in available_models:
-                            print(f"✅ Model {model} is available")
+                            logger.debug("Model %s is available", model)
                         else:
-                            print(f"❌ Model {model} is NOT available")
+                            logger.debug("Model %s is NOT available", model)
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not verify OpenAI model access: {e}")
-                    print("⚠️ Proceeding with configuration, but you may encounter model access errors")
-
-                # Initialize NeMo GuardRails with the config
-                config = RailsConfig.from_path(config_path)
-                print("✅ RailsConfig loaded successfully")
+                    logger.warning("Could not verify OpenAI model access: %s", e)
+                    logger.warning("Proceeding with configuration, but you may encounter model access errors")
 
-                self.rails = LLMRails(config)
-                print("✅ FactChecker: NeMo GuardRails initialized successfully")
+                # Initialize NeMo GuardRails with the config; the Rails instance
+                # is shared process-wide so repeat constructions are cheap
+                self.rails = _shared_rails(config_path)
+                logger.info("FactChecker: NeMo GuardRails initialized successfully")
             except Exception as e:
-                print(f"⚠️ FactChecker: Failed to initialize NeMo GuardRails: {e}")
-                print(f"⚠️ Error type: {type(e).__name__}")
-                import traceback
-                print(f"⚠️ Full traceback: {traceback.format_exc()}")
+                logger.warning("FactChecker: Failed to initialize NeMo GuardRails: %s (%s)",
+                               e, type(e).__name__, exc_info=True)
                 self.rails = None
         else:
-            print("❌ NeMo GuardRails not available - install with: pip install nemoguardrails")
+            logger.warning("NeMo GuardRails not available - install with: pip install nemoguardrails")
             self.rails = None
 
-    def scan(self, messages: List[Dict], context: str = "") -> Dict:
+    def scan(self, messages: List[Dict], context: str = "") -> ScanResult:
         """Scan messages for factual accuracy using NeMo GuardRails"""
         try:
-            # Extract assistant messages for fact-checking
-            assistant_messages = [msg for msg in messages if msg.get("type") == "assistant"]
-            if not assistant_messages:
+            # Only the last assistant message is fact-checked, so scan backwards
+            # instead of materializing the full filtered list
+            last_assistant = next((msg for msg in reversed(messages) if msg.get("type") == "assistant"), None)
+            if last_assistant is None:
                 return {"error": "No assistant messages to fact-check", "scanner": "FactsChecker"}
 
-            last_message = assistant_messages[-1]["content"]
+            last_message = last_assistant["content"]
+
+            # Fast prefilter: a very short message with no numeric content cannot
+            # carry the fabricated statistics this scanner looks for, so skip the
+            # NeMo LLM round-trip entirely
+            if len(last_message) < 40 and not any(ch.isdigit() or ch == '%' for ch in last_message):
+                return {
+                    "scanner": "FactsChecker",
+                    "decision": "ALLOW",
+                    "score": 0.1,
+                    "reason": "Fact-Check prefilter: message too short to contain verifiable statistical claims",
+                    "is_safe": True,
+                    "claims_detected": [],
+                    "analysis_method": "Length/charset prefilter"
+                }
 
             # Only use NeMo GuardRails - no heuristic fallback
             if self.rails is not None:
@@ -112,13 +286,13 @@ class FactCheckerScanner(NemoGuardRailsScanner):
                 return {"error": "NeMo GuardRails not properly initialized", "scanner": "FactsChecker"}
 
         except Exception as e:
-            print(f"❌ FactChecker error: {e}")
+            logger.error("FactChecker error: %s", e)
             return {"error": f"Error during fact-checking: {str(e)}", "scanner": "FactsChecker"}
 
-    def _nemo_fact_check(self, message: str, messages: List[Dict]) -> Dict:
+    def _nemo_fact_check(self, message: str, messages: List[Dict]) -> ScanResult:
         """Use NeMo GuardRails basic fact-checking - no customization"""
         try:
-            print(f"🔍 FactChecker: Using NeMo's built-in fact-checking on: {message[:100]}...")
+            logger.debug("FactChecker: Using NeMo's built-in fact-checking on: %.100s...", message)
 
             # Create an explicit fact-checking prompt that emphasizes detecting fabricated statistics
             fact_check_prompt = f"""Fact-check the following statement for false or fabricated claims:
@@ -137,19 +311,7 @@ Does this contain any fabricated, false, or unsourced statistical claims? If YES
                 prompt=fact_check_prompt
             )
 
-            print(f"🔍 NeMo response: {response}")
-            print(f"🔍 Response type: {type(response)}")
-            print(f"🔍 Response attributes: {[attr for attr in dir(response) if not attr.startswith('_')]}")
-
-            # Check actual response content
-            if hasattr(response, 'response'):
-                print(f"🔍 response.response: {response.response}")
-            if hasattr(response, 'llm_output'):
-                print(f"🔍 response.llm_output: {response.llm_output}")
-            if hasattr(response, 'state'):
-                print(f"🔍 response.state: {response.state}")
-            if hasattr(response, 'log'):
-                print(f"🔍 response.log: {response.log}")
+            logger.debug("NeMo response (%s): %s", type(response).__name__, response)
 
             # Analyze NeMo's response for fact-checking results
             nemo_response = str(response)
@@ -160,59 +322,18 @@ Does this contain any fabricated, false, or unsourced statistical claims? If YES
             if nemo_response and len(nemo_response) > 50:  # Substantial response
                 response_lower = nemo_response.lower()
 
-                # Look for indicators that NeMo found issues (expanded list)
-                false_claim_indicators = [
-                    "inaccuracies" in response_lower,
-                    "exaggerations" in response_lower,
-                    "misleading" in response_lower,
-                    "incorrect" in response_lower,
-                    "not supported" in response_lower,
-                    "not feasible" in response_lower,
-                    "rare for" in response_lower and "uniform" in response_lower,
-                    "the assertion" in response_lower and "not" in response_lower,
-                    "the claim" in response_lower and ("incorrect" in response_lower or "wrong" in response_lower),
-                    # Additional indicators based on actual NeMo responses
-                    "unlikely" in response_lower and ("highly" in response_lower or "quite" in response_lower),
-                    "improbable" in response_lower,
-                    "not accurate" in response_lower,
-                    "unrealistic" in response_lower,
-                    "lack a basis in reality" in response_lower,
-                    "don't reflect" in response_lower and ("real-world" in response_lower or "reality" in response_lower),
-                    "not scientifically validated" in response_lower,
-                    "vary widely" in response_lower and "unlikely" in response_lower,
-                    "claiming that" in response_lower and "not accurate" in response_lower,
-                    # Fabricated statistics and unsourced claims
-                    "fabricated" in response_lower,
-                    "made up" in response_lower,
-                    "no evidence" in response_lower,
-                    "without evidence" in response_lower,
-                    "no source" in response_lower,
-                    "unsubstantiated" in response_lower,
-                    "without citation" in response_lower,
-                    "lacks evidence" in response_lower,
-                    "no basis" in response_lower,
-                    "cannot be verified" in response_lower,
-                    "no data" in response_lower and "support" in response_lower,
-                    "invented" in response_lower and ("statistic" in response_lower or "number" in response_lower or "percentage" in response_lower),
-                    "specific percentage" in response_lower and ("cannot" in response_lower or "no" in response_lower)
-                ]
-
-                if any(false_claim_indicators):
+                # Single pass over the response collects every indicator keyword at once,
+                # then the precompiled rule table decides whether NeMo found issues
+                hits = _keyword_hits(response_lower)
+
+                if _matches_false_claim_rules(hits):
                     has_false_claims = True
 
-                    # Extract specific claims mentioned by NeMo
-                    if "gdp growth" in response_lower:
-                        claims_detected.append("GDP growth uniformity claim")
-                    if "100% cure rate" in response_lower or "cancer" in response_lower:
-                        claims_detected.append("Cancer cure rate claim")
-                    if "unemployment" in response_lower:
-                        claims_detected.append("Global unemployment rate claim")
-                    if "water" in response_lower or "2.3 liters" in response_lower:
-                        claims_detected.append("Daily consumption claim")
-                    if "coordinates" in response_lower or "population" in response_lower:
-                        claims_detected.append("Geographic/population claims")
-                    if "1847" in response_lower or "civilization" in response_lower:
-                        claims_detected.append("Historical civilization claim")
+                    # Extract specific claims mentioned by NeMo from the same hits set
+                    claims_detected = [
+                        label for label, keywords in _CLAIM_RULES
+                        if any(keyword in hits for keyword in keywords)
+                    ]
 
             # Set decision based on analysis
             # NOTE: Score represents RISK level (0=safe, 1=dangerous)
@@ -238,7 +359,5 @@ Does this contain any fabricated, false, or unsourced statistical claims? If YES
             }
 
         except Exception as e:
-            print(f"❌ NeMo fact-checking failed: {e}")
-            import traceback
-            print(f"❌ Full traceback: {traceback.format_exc()}")
+            logger.error("NeMo fact-checking failed: %s", e, exc_info=True)
             return {"error": f"NeMo fact-checking failed: {str(e)}", "scanner": "FactsChecker"}
\ No newline at end of file
@@ -6,6 +6,7 @@ from .scenario_manager import (
     ensure_scenarios_dir,
     load_saved_scenarios,
     save_scenarios_to_file,
+    flush_scenarios,
     save_scenario,
     delete_scenario,
     get_scenario,
@@ -16,6 +17,7 @@ __all__ = [
     'ensure_scenarios_dir',
     'load_saved_scenarios',
     'save_scenarios_to_file',
+    'flush_scenarios',
     'save_scenario',
     'delete_scenario',
     'get_scenario',
@@ -3,14 +3,39 @@ Scenario Management for AI Agent Guards Testing Application
 Handles loading, saving, and retrieving test scenarios
 """
 
+import copy
+import functools
 import json
 import os
+import sys
+from pathlib import Path
 from typing import Dict, Optional
-from datetime import datetime
+
+# orjson encodes/decodes several times faster than stdlib json; fall back
+# to stdlib when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson enables streaming single-key lookups in large scenario files
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Above this size, a cold-cache get_scenario streams instead of parsing
+# the whole file
+_STREAM_THRESHOLD = 256 * 1024
 
 # Persistent Scenario Storage System
 # Use /tmp on HF Spaces/cloud environments (read-only filesystem issue)
 # Use local directory for development
+# Cached and computed on first use so importing the module does no
+# filesystem probing (HF Spaces cold starts)
+@functools.lru_cache(maxsize=1)
 def get_scenarios_dir():
     """Get appropriate scenarios directory based on environment"""
     # Check if we're in a read-only environment (HF Spaces, Docker)
@@ -27,70 +52,160 @@ def get_scenarios_dir():
     # Fall back to /tmp for read-only filesystems
     return "/tmp/saved_scenarios"
 
-SCENARIOS_DIR = get_scenarios_dir()
-SCENARIOS_FILE = os.path.join(SCENARIOS_DIR, "scenarios.json")
+@functools.lru_cache(maxsize=1)
+def _scenarios_file() -> Path:
+    return Path(get_scenarios_dir()) / "scenarios.json"
+
+
+# The makedirs check only needs to run once per process
+_dir_ensured = False
 
 
 def ensure_scenarios_dir():
     """Ensure the scenarios directory exists"""
-    if not os.path.exists(SCENARIOS_DIR):
-        os.makedirs(SCENARIOS_DIR)
+    global _dir_ensured
+    if not _dir_ensured:
+        Path(get_scenarios_dir()).mkdir(parents=True, exist_ok=True)
+        _dir_ensured = True
+
+
+# In-memory cache of the parsed scenarios file, keyed by mtime so repeated
+# loads (UI refreshes) skip the open+parse when the file is unchanged
+_cache = {"mtime": None, "data": None}
+
+# Tracks in-memory mutations that have not been written to disk yet
+_dirty = False
 
 
 def load_saved_scenarios() -> Dict[str, Dict]:
     """Load all saved scenarios from file"""
-    ensure_scenarios_dir()
-    if os.path.exists(SCENARIOS_FILE):
-        try:
-            with open(SCENARIOS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading saved scenarios: {e}")
-            return {}
-    return {}
+    # EAFP: the stat covers both a missing directory and a missing file,
+    # so the read path needs no directory pre-checks
+    try:
+        mtime = os.stat(_scenarios_file()).st_mtime_ns
+    except FileNotFoundError:
+        # Keep returning the same (possibly mutated, unflushed) dict until
+        # a flush creates the file
+        if _cache["data"] is None:
+            _cache["data"] = {}
+        return _cache["data"]
+    if mtime == _cache["mtime"]:
+        return _cache["data"]
+    try:
+        # One binary read() pulls the whole file in a single syscall; both
+        # decoders parse straight from the bytes with no text-layer decode
+        with open(_scenarios_file(), 'rb') as f:
+            buf = f.read()
+        data = orjson.loads(buf) if ORJSON_AVAILABLE else json.loads(buf)
+    except (ValueError, IOError) as e:
+        print(f"Error loading saved scenarios: {e}")
+        # Seed the cache like the missing-file path so later mutations
+        # land in _cache['data'] and the next flush rewrites the corrupt
+        # file; returning a fresh {} here would orphan those mutations
+        if _cache["data"] is None:
+            _cache["data"] = {}
+        _cache["mtime"] = None
+        return _cache["data"]
+    _cache["mtime"] = mtime
+    _cache["data"] = data
+    return data
 
 
 def save_scenarios_to_file(scenarios: Dict[str, Dict]):
-    """Save all scenarios to file"""
+    """Save all scenarios to file (atomic: serialize once, write a sibling
+    temp file, then os.replace so a crash cannot truncate scenarios.json)"""
     ensure_scenarios_dir()
     try:
-        with open(SCENARIOS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(scenarios, f, indent=2, ensure_ascii=False)
-    except IOError as e:
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(scenarios, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(scenarios, indent=2, ensure_ascii=False).encode('utf-8')
+        tmp_path = _scenarios_file().with_name("scenarios.json.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, _scenarios_file())
+    except OSError as e:
         print(f"Error saving scenarios: {e}")
+        return
+    # Refresh the cache in place so the next load skips the re-read
+    try:
+        _cache["mtime"] = os.stat(_scenarios_file()).st_mtime_ns
+    except OSError:
+        _cache["mtime"] = None
+    _cache["data"] = scenarios
+
+
+def flush_scenarios():
+    """Write the in-memory store to disk if it has unflushed changes"""
+    global _dirty
+    if _dirty and _cache["data"] is not None:
+        save_scenarios_to_file(_cache["data"])
+        _dirty = False
+
 
+def save_scenario(name: str, scenario_data: Dict, flush: bool = True) -> bool:
+    """Save a single scenario with given name.
 
-def save_scenario(name: str, scenario_data: Dict) -> bool:
-    """Save a single scenario with given name"""
+    Pass flush=False when saving many scenarios in a loop and call
+    flush_scenarios() once at the end to collapse the writes into one.
+    """
+    from datetime import datetime
+
+    global _dirty
     scenarios = load_saved_scenarios()
-    scenarios[name] = {
-        **scenario_data,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
-    }
-    save_scenarios_to_file(scenarios)
+    now = datetime.now().isoformat()
+    # Re-saves keep the original creation time
+    existing = scenarios.get(name)
+    # One C-level copy plus two assignments, instead of re-unpacking every
+    # key through {**scenario_data, ...}
+    entry = scenario_data.copy()
+    entry["created_at"] = existing.get("created_at", now) if existing else now
+    entry["updated_at"] = now
+    scenarios[name] = entry
+    _dirty = True
+    if flush:
+        flush_scenarios()
     return True
 
 
-def delete_scenario(name: str) -> bool:
+def delete_scenario(name: str, flush: bool = True) -> bool:
     """Delete a scenario by name"""
+    global _dirty
     scenarios = load_saved_scenarios()
     if name in scenarios:
         del scenarios[name]
-        save_scenarios_to_file(scenarios)
+        _dirty = True
+        if flush:
+            flush_scenarios()
         return True
     return False
 
 
 def get_scenario(name: str) -> Optional[Dict]:
     """Get a specific scenario by name"""
-    scenarios = load_saved_scenarios()
-    return scenarios.get(name)
+    # Warm cache: plain dict lookup. Cold cache over a large store: stream
+    # top-level entries and stop at the requested key instead of parsing
+    # every scenario.
+    if _cache["data"] is None and IJSON_AVAILABLE:
+        try:
+            large = os.path.getsize(_scenarios_file()) > _STREAM_THRESHOLD
+        except OSError:
+            large = False
+        if large:
+            with open(_scenarios_file(), 'rb') as f:
+                for key, value in ijson.kvitems(f, ''):
+                    if key == name:
+                        return value
+            return None
+    return load_saved_scenarios().get(name)
 
 
-def get_predefined_scenarios() -> Dict[str, Dict]:
-    """Get all predefined test scenarios"""
-    return {
+# Built once at import so the ~8-entry nested literal is not re-allocated on
+# every call; get_predefined_scenarios hands out fresh copies because callers
+# load these into session state and the conversation builder mutates them.
+_PREDEFINED_SCENARIOS = {
         "Legitimate Banking": {
             "purpose": "Check account balance and recent transactions",
             "messages": [
@@ -169,4 +284,22 @@ def get_predefined_scenarios() -> Dict[str, Dict]:
                  "action_input": {"to": "reservations@external-processor.com", "body": "CC: 4532-1234-5678-9010"}}
             ]
         }
-    }
\ No newline at end of file
+    }
+
+
+def _intern_message_strings(scenarios: Dict[str, Dict]):
+    """Intern the repeated message keys and type tags so every message dict
+    shares one backing string object per key (identity fast path in lookups)"""
+    for scenario in scenarios.values():
+        for message in scenario.get("messages", []):
+            for key in list(message):
+                message[sys.intern(key)] = message.pop(key)
+            message["type"] = sys.intern(message["type"])
+
+
+_intern_message_strings(_PREDEFINED_SCENARIOS)
+
+
+def get_predefined_scenarios() -> Dict[str, Dict]:
+    """Get all predefined test scenarios"""
+    return copy.deepcopy(_PREDEFINED_SCENARIOS)
@@ -3,38 +3,139 @@ from .banking_agent import BankingAgent
 from .travel_agent import TravelAgent  
 from .email_agent import EmailAgent
 from ..security.firewall_integration import SecurityManager
+from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.memory import MemorySaver
+
+# SqliteSaver persists conversation checkpoints across process restarts;
+# it ships separately (langgraph-checkpoint-sqlite), so it is optional and
+# the in-memory saver remains the fallback
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    SQLITE_SAVER_AVAILABLE = True
+except ImportError:
+    SQLITE_SAVER_AVAILABLE = False
 import logging
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 
+# pyahocorasick scans every agent's routing keywords in a single pass over
+# the input; fall back to per-agent substring loops when it is not installed
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# redisvl's SemanticCache answers paraphrased repeats of earlier prompts
+# without an LLM call; it needs a running Redis, so it is strictly optional
+try:
+    from redisvl.extensions.llmcache import SemanticCache
+    REDISVL_AVAILABLE = True
+except ImportError:
+    REDISVL_AVAILABLE = False
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """One routed request in a session; slotted, so each entry costs a few
+    machine words instead of a dict"""
+    agent: str
+    request_prefix: str
+    timestamp_ns: int
+
+
+@dataclass(slots=True)
+class Session:
+    """Per-thread session state tracked by the manager"""
+    user_goal: str
+    created_at_ns: int
+    agent_history: List[HistoryEntry] = field(default_factory=list)
+
+
 class MultiAgentManager:
     """Orchestrates multiple specialized agents with security oversight"""
     
     def __init__(self):
+        self.logger = logging.getLogger("MultiAgentManager")
+
         # Initialize security manager
         self.security_manager = SecurityManager()
-        
-        # Initialize specialized agents
+
+        # Shared semantic response cache; scenarios replay near-identical
+        # prompts, so cache hits skip the LLM round-trip entirely
+        self.response_cache = None
+        if REDISVL_AVAILABLE:
+            try:
+                self.response_cache = SemanticCache(name="agents", distance_threshold=0.1)
+            except Exception as e:
+                self.logger.warning(f"Semantic cache unavailable, continuing without it: {e}")
+
+        # One LLM client and one checkpointer shared by every agent: the
+        # client holds the connection pool and tokenizer, so duplicating it
+        # per agent tripled cold-start cost and split the keep-alive pool
+        self._llm = ChatOpenAI(model="gpt-4", temperature=0, timeout=30)
+
+        # Persist checkpoints in SQLite when available, so replayed threads
+        # resume from stored state across runs instead of starting cold.
+        # Deployment filesystems can be read-only (same concern as
+        # get_scenarios_dir in scenario_manager), so the DB lands in a
+        # writable directory and any failure to open it falls back to the
+        # in-memory saver instead of killing manager construction.
+        self._checkpointer = None
+        if SQLITE_SAVER_AVAILABLE:
+            import os
+            import sqlite3
+            db_dir = os.getcwd() if os.access(os.getcwd(), os.W_OK) else "/tmp"
+            try:
+                conn = sqlite3.connect(
+                    os.path.join(db_dir, "agent_state.db"), check_same_thread=False
+                )
+                self._checkpointer = SqliteSaver(conn)
+            except sqlite3.Error as e:
+                self.logger.warning(f"SQLite checkpointer unavailable, using in-memory saver: {e}")
+        if self._checkpointer is None:
+            self._checkpointer = MemorySaver()
+
+        # Initialize specialized agents; they differ only in tools and
+        # system prompt
         self.agents = {
-            "banking": BankingAgent(self.security_manager),
-            "travel": TravelAgent(self.security_manager),
-            "email": EmailAgent(self.security_manager)
+            "banking": BankingAgent(self.security_manager, response_cache=self.response_cache,
+                                    llm=self._llm, checkpointer=self._checkpointer),
+            "travel": TravelAgent(self.security_manager, response_cache=self.response_cache,
+                                  llm=self._llm, checkpointer=self._checkpointer),
+            "email": EmailAgent(self.security_manager, response_cache=self.response_cache,
+                                llm=self._llm, checkpointer=self._checkpointer)
         }
-        
-        self.logger = logging.getLogger("MultiAgentManager")
-        
+
         # Track active sessions
-        self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        self.active_sessions: Dict[str, Session] = {}
+
+        # Build the routing automaton once: one DFA traversal of the lowered
+        # input replaces a lowercase plus ~10 substring scans per agent.
+        # Keywords map to small integer agent ids so the scoring pass fills a
+        # fixed-size list instead of building a dict per request.
+        self._agent_list = tuple(self.agents.values())
+        self._keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for agent_id, agent in enumerate(self._agent_list):
+                for keyword in agent.KEYWORDS:
+                    # Keyword length travels with the id so hits can be
+                    # boundary-checked against the match start position
+                    automaton.add_word(keyword, (agent_id, len(keyword)))
+            automaton.make_automaton()
+            self._keyword_automaton = automaton
     
     def route_request(self, user_input: str, thread_id: str, user_goal: str = "") -> Dict[str, Any]:
         """Route user request to appropriate agent"""
         try:
             # Initialize session if new
-            if thread_id not in self.active_sessions:
-                self.active_sessions[thread_id] = {
-                    "user_goal": user_goal,
-                    "agent_history": [],
-                    "created_at": datetime.now().isoformat()
-                }
+            # Timestamps stay as raw nanosecond ints on the hot path; they
+            # are rendered to ISO strings only in get_session_info
+            session = self.active_sessions.get(thread_id)
+            if session is None:
+                session = Session(user_goal=user_goal, created_at_ns=time.time_ns())
+                self.active_sessions[thread_id] = session
             
             # Determine best agent for request
             selected_agent = self._select_agent(user_input)
@@ -47,11 +148,11 @@ class MultiAgentManager:
                 }
             
             # Track agent usage
-            self.active_sessions[thread_id]["agent_history"].append({
-                "agent": selected_agent.name,
-                "request": user_input[:100],  # Truncate for logging
-                "timestamp": datetime.now().isoformat()
-            })
+            session.agent_history.append(HistoryEntry(
+                agent=selected_agent.name,
+                request_prefix=user_input[:100],  # Truncate for logging
+                timestamp_ns=time.time_ns()
+            ))
             
             # Execute request through selected agent
             result = selected_agent.execute(user_input, thread_id, user_goal)
@@ -61,7 +162,7 @@ class MultiAgentManager:
                 "routing_info": {
                     "selected_agent": selected_agent.name,
                     "thread_id": thread_id,
-                    "session_length": len(self.active_sessions[thread_id]["agent_history"])
+                    "session_length": len(session.agent_history)
                 }
             })
             
@@ -75,38 +176,98 @@ class MultiAgentManager:
                 "error": str(e)
             }
     
+    async def aroute_request(self, user_input: str, thread_id: str, user_goal: str = "") -> Dict[str, Any]:
+        """Async variant of route_request for running scenarios concurrently"""
+        try:
+            # Initialize session if new
+            # Timestamps stay as raw nanosecond ints on the hot path; they
+            # are rendered to ISO strings only in get_session_info
+            session = self.active_sessions.get(thread_id)
+            if session is None:
+                session = Session(user_goal=user_goal, created_at_ns=time.time_ns())
+                self.active_sessions[thread_id] = session
+
+            # Determine best agent for request
+            selected_agent = self._select_agent(user_input)
+
+            if not selected_agent:
+                return {
+                    "status": "no_agent_match",
+                    "message": "I'm not sure which service can help with that request. Could you be more specific?",
+                    "available_agents": list(self.agents.keys())
+                }
+
+            # Track agent usage
+            session.agent_history.append(HistoryEntry(
+                agent=selected_agent.name,
+                request_prefix=user_input[:100],  # Truncate for logging
+                timestamp_ns=time.time_ns()
+            ))
+
+            # Execute request through selected agent
+            result = await selected_agent.aexecute(user_input, thread_id, user_goal)
+
+            # Add orchestration metadata
+            result.update({
+                "routing_info": {
+                    "selected_agent": selected_agent.name,
+                    "thread_id": thread_id,
+                    "session_length": len(session.agent_history)
+                }
+            })
+
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error in request routing: {e}")
+            return {
+                "status": "routing_error",
+                "message": "An error occurred while processing your request.",
+                "error": str(e)
+            }
+
     def _select_agent(self, user_input: str) -> Optional[Any]:
         """Select most appropriate agent based on input analysis"""
-        # Score each agent's suitability
-        agent_scores = {}
-        
-        for name, agent in self.agents.items():
-            if agent.validate_request(user_input):
-                # Simple scoring based on keyword matching
-                score = self._calculate_agent_score(user_input, agent)
-                agent_scores[name] = score
-        
-        # Return agent with highest score
-        if agent_scores:
-            best_agent_name = max(agent_scores, key=agent_scores.get)
-            return self.agents[best_agent_name]
-        
-        return None
+        user_input_lower = user_input.lower()
+
+        if self._keyword_automaton is not None:
+            # One automaton sweep validates and scores every agent at once.
+            # Hits must start at a word boundary so this path agrees with
+            # the agents' \b-anchored validate_request regexes ('mail'
+            # inside 'blackmailer' counts for neither)
+            scores = [0] * len(self._agent_list)
+            for end_index, (agent_id, length) in self._keyword_automaton.iter(user_input_lower):
+                start = end_index - length + 1
+                if start and (user_input_lower[start - 1].isalnum() or user_input_lower[start - 1] == "_"):
+                    continue
+                scores[agent_id] += 1
+            best = max(range(len(scores)), key=scores.__getitem__)
+            return self._agent_list[best] if scores[best] else None
+
+        # Fallback: one fused validate-and-score pass tracking the running
+        # best, instead of building a score dict and re-probing it via
+        # max(..., key=...). Ties keep the first agent, as before; a
+        # validated agent wins even at score 0.
+        best_agent = None
+        best_score = -1.0
+        for agent in self._agent_list:
+            if not agent.validate_request(user_input):
+                continue
+            score = self._calculate_agent_score(user_input, agent)
+            if score > best_score:
+                best_score = score
+                best_agent = agent
+
+        return best_agent
     
     def _calculate_agent_score(self, user_input: str, agent) -> float:
         """Calculate relevance score for agent selection"""
-        # This could be enhanced with more sophisticated NLP
-        capabilities = agent.get_capabilities()
-        user_input_lower = user_input.lower()
-        
-        score = 0
-        for capability in capabilities:
-            capability_words = capability.lower().split()
-            for word in capability_words:
-                if word in user_input_lower:
-                    score += 1
-        
-        return score / len(capabilities) if capabilities else 0
+        # This could be enhanced with more sophisticated NLP; the capability
+        # tokens are precomputed per agent, so scoring is one set intersection
+        if not agent._capability_count:
+            return 0
+        input_words = set(user_input.lower().split())
+        return len(agent._capability_tokens & input_words) / agent._capability_count
     
     def get_session_info(self, thread_id: str) -> Dict[str, Any]:
         """Get information about active session"""
@@ -115,9 +276,24 @@ class MultiAgentManager:
         
         session = self.active_sessions[thread_id]
         security_summary = self.security_manager.get_trace_summary(thread_id)
-        
+
+        # Sessions are slotted dataclasses internally; serialize to plain
+        # dicts (with ISO timestamps) only here, at the JSON boundary
+        session_view = {
+            "user_goal": session.user_goal,
+            "created_at": datetime.fromtimestamp(session.created_at_ns / 1e9).isoformat(),
+            "agent_history": [
+                {
+                    "agent": entry.agent,
+                    "request": entry.request_prefix,
+                    "timestamp": datetime.fromtimestamp(entry.timestamp_ns / 1e9).isoformat()
+                }
+                for entry in session.agent_history
+            ]
+        }
+
         return {
-            "session": session,
+            "session": session_view,
             "security_summary": security_summary,
             "available_agents": [
                 {
@@ -1,11 +1,27 @@
 from .base_agent import BaseAgent
 from ..tools.banking_tools import banking_tools
-from typing import List
+from typing import Tuple
+import re
+import sys
+
+# Routing keywords, built once at import as a frozenset of interned
+# strings; also fed into MultiAgentManager's keyword automaton
+_KEYWORDS = frozenset(map(sys.intern, (
+    "balance", "account", "transaction", "transfer", "payment",
+    "money", "deposit", "withdrawal", "banking", "financial"
+)))
+
+# One compiled alternation scans the input at C speed instead of a
+# Python loop of substring searches. The leading \b stops mid-word
+# hits while still matching plural/suffixed forms of the keywords.
+_KEYWORD_RE = re.compile(r"\b(?:" + "|".join(sorted(_KEYWORDS)) + r")", re.IGNORECASE)
 
 class BankingAgent(BaseAgent):
     """Specialized agent for banking and financial operations"""
-    
-    def __init__(self, security_manager=None):
+
+    KEYWORDS = _KEYWORDS
+
+    def __init__(self, security_manager=None, response_cache=None, llm=None, checkpointer=None):
         system_prompt = """You are a professional banking assistant. Your role is to help users with:
         - Checking account balances
         - Reviewing transaction history  
@@ -23,23 +39,24 @@ class BankingAgent(BaseAgent):
             name="BankingAgent",
             tools=banking_tools,
             system_prompt=system_prompt,
-            security_manager=security_manager
+            security_manager=security_manager,
+            response_cache=response_cache,
+            llm=llm,
+            checkpointer=checkpointer
         )
     
-    def get_capabilities(self) -> List[str]:
-        return [
-            "Check account balances",
-            "Review transaction history", 
-            "Transfer funds (with confirmation)",
-            "Account security monitoring"
-        ]
+    # Capability strings are constants; a class-level tuple avoids a
+    # fresh list allocation on every call
+    CAPABILITIES = (
+        "Check account balances",
+        "Review transaction history",
+        "Transfer funds (with confirmation)",
+        "Account security monitoring",
+    )
+
+    def get_capabilities(self) -> Tuple[str, ...]:
+        return self.CAPABILITIES
     
     def validate_request(self, user_input: str) -> bool:
         """Check if request is banking-related"""
-        banking_keywords = [
-            "balance", "account", "transaction", "transfer", "payment",
-            "money", "deposit", "withdrawal", "banking", "financial"
-        ]
-        
-        user_input_lower = user_input.lower()
-        return any(keyword in user_input_lower for keyword in banking_keywords)
\ No newline at end of file
+        return _KEYWORD_RE.search(user_input) is not None
\ No newline at end of file
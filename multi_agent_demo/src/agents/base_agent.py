@@ -1,36 +1,43 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import BaseTool
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
+import asyncio
 import logging
 
 class BaseAgent(ABC):
     """Base class for specialized agents with security integration"""
 
-    def __init__(self, 
-                 name: str, 
-                 tools: List[BaseTool], 
+    def __init__(self,
+                 name: str,
+                 tools: List[BaseTool],
                  system_prompt: str,
                  security_manager=None,
-                 model_name: str = "gpt-4"):
+                 model_name: str = "gpt-4",
+                 response_cache=None,
+                 llm=None,
+                 checkpointer=None):
 
         self.name = name
         self.tools = tools
         self.system_prompt = system_prompt
         self.security_manager = security_manager
+        self.response_cache = response_cache
         self.logger = logging.getLogger(f"Agent.{name}")
 
-        # Initialize LLM
-        self.llm = ChatOpenAI(
+        # Use the shared LLM client and checkpointer when the manager
+        # provides them (one connection pool and tokenizer for all agents);
+        # standalone construction still builds its own
+        self.llm = llm if llm is not None else ChatOpenAI(
             model=model_name,
             temperature=0,
             timeout=30
         )
 
         # Create agent with memory
-        self.memory = MemorySaver()
+        self.memory = checkpointer if checkpointer is not None else MemorySaver()
 
         # Set system prompt in the LLM
         self.llm_with_prompt = self.llm.with_config(
@@ -39,11 +46,59 @@ class BaseAgent(ABC):
 
         # Create agent with memory
         self.agent_executor = create_react_agent(
-            self.llm_with_prompt, 
-            self.tools, 
+            self.llm_with_prompt,
+            self.tools,
             checkpointer=self.memory
         )
 
+        # Precompute the routing-score inputs: capabilities are constant per
+        # agent, so tokenize them once here instead of on every request
+        capabilities = self.get_capabilities()
+        self._capability_tokens = frozenset(
+            word for capability in capabilities for word in capability.lower().split()
+        )
+        self._capability_count = len(capabilities)
+
+    def _cached_response(self, user_input: str, thread_id: str) -> Optional[Dict[str, Any]]:
+        """Return a completed result from the semantic cache, or None.
+
+        The cache key is prefixed with agent name and thread_id so hits
+        never leak responses across agents or sessions."""
+        if self.response_cache is None:
+            return None
+        try:
+            hit = self.response_cache.check(
+                prompt=f"{self.name}:{thread_id}:{user_input}", num_results=1
+            )
+        except Exception as e:
+            self.logger.warning(f"Semantic cache check failed: {e}")
+            return None
+        if not hit:
+            return None
+        cached = hit[0]["response"]
+        # Keep the security trace complete even when the LLM is skipped
+        if self.security_manager:
+            from langchain_core.messages import HumanMessage, AIMessage
+            self.security_manager.add_to_trace_batch(thread_id, [
+                HumanMessage(content=user_input), AIMessage(content=cached)
+            ])
+        return {
+            "status": "success",
+            "response": cached,
+            "agent": self.name,
+            "thread_id": thread_id,
+            "cached": True
+        }
+
+    def _store_cached_response(self, user_input: str, thread_id: str, response_text: str):
+        """Store a completed response in the semantic cache"""
+        if self.response_cache is None:
+            return
+        try:
+            self.response_cache.store(f"{self.name}:{thread_id}:{user_input}", response_text)
+        except Exception as e:
+            self.logger.warning(f"Semantic cache store failed: {e}")
+
     def execute(self, user_input: str, thread_id: str, user_goal: str = "") -> Dict[str, Any]:
         """Execute agent action with security checks"""
         try:
@@ -58,6 +113,12 @@ class BaseAgent(ABC):
                         "agent": self.name
                     }
 
+            # Serve paraphrased repeats of earlier prompts from the semantic
+            # cache instead of a fresh LLM round-trip
+            cached_result = self._cached_response(user_input, thread_id)
+            if cached_result is not None:
+                return cached_result
+
             # Configure thread for conversation persistence
             config = {"configurable": {"thread_id": thread_id}}
 
@@ -65,22 +126,100 @@ class BaseAgent(ABC):
             from langchain_core.messages import HumanMessage
             user_message = HumanMessage(content=user_input)
 
-            # Add user input to security trace first
+            # Execute agent
+            response = self.agent_executor.invoke(
+                {"messages": [{"role": "user", "content": user_input}]},
+                config
+            )
+
+            # Record both turns of this step with one batched trace append
             if self.security_manager:
-                self.security_manager.add_to_trace(thread_id, user_message)
+                self.security_manager.add_to_trace_batch(
+                    thread_id, [user_message, response["messages"][-1]]
+                )
+
+                # Check alignment if user goal provided
+                if user_goal:
+                    # check_agent_alignment memoizes on the incremental
+                    # trace hash, so unchanged traces skip the LLM check
+                    alignment_check = self.security_manager.check_agent_alignment(thread_id, user_goal)
+                    if not alignment_check["is_safe"]:
+                        return {
+                            "status": "alignment_violation",
+                            "reason": "Agent behavior misaligned with user goal",
+                            "details": alignment_check,
+                            "agent": self.name
+                        }
+
+            # Only responses that passed every guard are worth replaying
+            self._store_cached_response(user_input, thread_id, response["messages"][-1].content)
+
+            return {
+                "status": "success",
+                "response": response["messages"][-1].content,
+                "agent": self.name,
+                "thread_id": thread_id
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error executing agent {self.name}: {e}")
+            return {
+                "status": "error",
+                "reason": f"Agent execution failed: {str(e)}",
+                "agent": self.name
+            }
+
+    async def aexecute(self, user_input: str, thread_id: str, user_goal: str = "") -> Dict[str, Any]:
+        """Async variant of execute; awaits the LLM call so independent
+        scenarios can run concurrently (the cost is network latency, not CPU)"""
+        try:
+            # The guard must finish before the agent is dispatched: the
+            # react agent calls side-effecting tools (transfers, emails),
+            # and cancelling an in-flight invocation cannot undo work it
+            # already did. The scan still runs in a worker thread so the
+            # event loop stays free for other concurrent scenarios.
+            if self.security_manager:
+                input_check = await asyncio.to_thread(
+                    self.security_manager.scan_user_input, user_input, thread_id
+                )
+                if not input_check["is_safe"]:
+                    return {
+                        "status": "blocked",
+                        "reason": "Security violation detected",
+                        "details": input_check,
+                        "agent": self.name
+                    }
+
+            # Serve paraphrased repeats of earlier prompts from the semantic
+            # cache instead of a fresh LLM round-trip
+            cached_result = self._cached_response(user_input, thread_id)
+            if cached_result is not None:
+                return cached_result
+
+            # Configure thread for conversation persistence
+            config = {"configurable": {"thread_id": thread_id}}
+
+            # Create a HumanMessage from user input
+            from langchain_core.messages import HumanMessage
+            user_message = HumanMessage(content=user_input)
 
             # Execute agent
-            response = self.agent_executor.invoke(
-                {"messages": [{"role": "user", "content": user_input}]}, 
+            response = await self.agent_executor.ainvoke(
+                {"messages": [{"role": "user", "content": user_input}]},
                 config
             )
 
-            # Add AI response to security trace
+            # Record both turns of this step with one batched trace append;
+            # the user turn is only recorded because the guard cleared it
             if self.security_manager:
-                self.security_manager.add_to_trace(thread_id, response["messages"][-1])
+                self.security_manager.add_to_trace_batch(
+                    thread_id, [user_message, response["messages"][-1]]
+                )
 
                 # Check alignment if user goal provided
                 if user_goal:
+                    # check_agent_alignment memoizes on the incremental
+                    # trace hash, so unchanged traces skip the LLM check
                     alignment_check = self.security_manager.check_agent_alignment(thread_id, user_goal)
                     if not alignment_check["is_safe"]:
                         return {
@@ -90,6 +229,9 @@ class BaseAgent(ABC):
                             "agent": self.name
                         }
 
+            # Only responses that passed every guard are worth replaying
+            self._store_cached_response(user_input, thread_id, response["messages"][-1].content)
+
             return {
                 "status": "success",
                 "response": response["messages"][-1].content,
@@ -106,8 +248,8 @@ class BaseAgent(ABC):
             }
 
     @abstractmethod
-    def get_capabilities(self) -> List[str]:
-        """Return list of agent capabilities"""
+    def get_capabilities(self) -> Tuple[str, ...]:
+        """Return the agent's capability strings"""
         pass
 
     @abstractmethod
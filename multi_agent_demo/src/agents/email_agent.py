@@ -1,11 +1,27 @@
 from .base_agent import BaseAgent
 from ..tools.email_tools import email_tools
-from typing import List
+from typing import Tuple
+import re
+import sys
+
+# Routing keywords, built once at import as a frozenset of interned
+# strings; also fed into MultiAgentManager's keyword automaton
+_KEYWORDS = frozenset(map(sys.intern, (
+    "email", "inbox", "message", "send", "reply", "draft",
+    "compose", "mail", "correspondence"
+)))
+
+# One compiled alternation scans the input at C speed instead of a
+# Python loop of substring searches. The leading \b stops mid-word
+# hits while still matching plural/suffixed forms of the keywords.
+_KEYWORD_RE = re.compile(r"\b(?:" + "|".join(sorted(_KEYWORDS)) + r")", re.IGNORECASE)
 
 class EmailAgent(BaseAgent):
     """Specialized agent for email management and communication"""
-    
-    def __init__(self, security_manager=None):
+
+    KEYWORDS = _KEYWORDS
+
+    def __init__(self, security_manager=None, response_cache=None, llm=None, checkpointer=None):
         system_prompt = """You are a professional email management assistant. Your role is to help users with:
         - Reading and organizing emails
         - Drafting professional responses
@@ -22,25 +38,26 @@ class EmailAgent(BaseAgent):
         
         super().__init__(
             name="EmailAgent",
-            tools=email_tools, 
+            tools=email_tools,
             system_prompt=system_prompt,
-            security_manager=security_manager
+            security_manager=security_manager,
+            response_cache=response_cache,
+            llm=llm,
+            checkpointer=checkpointer
         )
     
-    def get_capabilities(self) -> List[str]:
-        return [
-            "Read and organize emails",
-            "Draft email responses",
-            "Send emails (with confirmation)",
-            "Email management assistance"
-        ]
+    # Capability strings are constants; a class-level tuple avoids a
+    # fresh list allocation on every call
+    CAPABILITIES = (
+        "Read and organize emails",
+        "Draft email responses",
+        "Send emails (with confirmation)",
+        "Email management assistance",
+    )
+
+    def get_capabilities(self) -> Tuple[str, ...]:
+        return self.CAPABILITIES
     
     def validate_request(self, user_input: str) -> bool:
         """Check if request is email-related"""
-        email_keywords = [
-            "email", "inbox", "message", "send", "reply", "draft",
-            "compose", "mail", "correspondence"
-        ]
-        
-        user_input_lower = user_input.lower()
-        return any(keyword in user_input_lower for keyword in email_keywords)
\ No newline at end of file
+        return _KEYWORD_RE.search(user_input) is not None
\ No newline at end of file
@@ -1,11 +1,27 @@
 from .base_agent import BaseAgent
 from ..tools.travel_tools import travel_tools
-from typing import List
+from typing import Tuple
+import re
+import sys
+
+# Routing keywords, built once at import as a frozenset of interned
+# strings; also fed into MultiAgentManager's keyword automaton
+_KEYWORDS = frozenset(map(sys.intern, (
+    "flight", "hotel", "travel", "book", "reservation", "trip",
+    "vacation", "destination", "airport", "accommodation"
+)))
+
+# One compiled alternation scans the input at C speed instead of a
+# Python loop of substring searches. The leading \b stops mid-word
+# hits while still matching plural/suffixed forms of the keywords.
+_KEYWORD_RE = re.compile(r"\b(?:" + "|".join(sorted(_KEYWORDS)) + r")", re.IGNORECASE)
 
 class TravelAgent(BaseAgent):
     """Specialized agent for travel planning and booking"""
-    
-    def __init__(self, security_manager=None):
+
+    KEYWORDS = _KEYWORDS
+
+    def __init__(self, security_manager=None, response_cache=None, llm=None, checkpointer=None):
         system_prompt = """You are an expert travel planning assistant. Your role is to help users with:
         - Searching for flights and accommodations
         - Comparing travel options and prices
@@ -24,23 +40,24 @@ class TravelAgent(BaseAgent):
             name="TravelAgent", 
             tools=travel_tools,
             system_prompt=system_prompt,
-            security_manager=security_manager
+            security_manager=security_manager,
+            response_cache=response_cache,
+            llm=llm,
+            checkpointer=checkpointer
         )
     
-    def get_capabilities(self) -> List[str]:
-        return [
-            "Search flights and hotels",
-            "Compare travel options",
-            "Book accommodations", 
-            "Travel planning assistance"
-        ]
+    # Capability strings are constants; a class-level tuple avoids a
+    # fresh list allocation on every call
+    CAPABILITIES = (
+        "Search flights and hotels",
+        "Compare travel options",
+        "Book accommodations",
+        "Travel planning assistance",
+    )
+
+    def get_capabilities(self) -> Tuple[str, ...]:
+        return self.CAPABILITIES
     
     def validate_request(self, user_input: str) -> bool:
         """Check if request is travel-related"""
-        travel_keywords = [
-            "flight", "hotel", "travel", "book", "reservation", "trip",
-            "vacation", "destination", "airport", "accommodation"
-        ]
-        
-        user_input_lower = user_input.lower()
-        return any(keyword in user_input_lower for keyword in travel_keywords)
\ No newline at end of file
+        return _KEYWORD_RE.search(user_input) is not None
\ No newline at end of file
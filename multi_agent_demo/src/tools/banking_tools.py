@@ -1,8 +1,8 @@
 from langchain_core.tools import tool
 from typing import Dict, List, Any
-import json
-import random
-from datetime import datetime, timedelta
+from secrets import token_hex
+
+from ..utils import json_dumps, now_iso
 
 # Simulated banking database
 MOCK_ACCOUNTS = {
@@ -34,17 +34,17 @@ def get_account_balance(account_type: str = "checking") -> str:
     user_id = "user123"  # In real app, get from session
     
     if user_id not in MOCK_ACCOUNTS:
-        return json.dumps({"error": "Account not found"})
+        return json_dumps({"error": "Account not found"})
     
     if account_type not in MOCK_ACCOUNTS[user_id]:
-        return json.dumps({"error": f"Account type {account_type} not found"})
+        return json_dumps({"error": f"Account type {account_type} not found"})
     
     account_info = MOCK_ACCOUNTS[user_id][account_type]
-    return json.dumps({
+    return json_dumps({
         "account_type": account_type,
         "balance": account_info["balance"],
         "account_id": account_info["account_id"],
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     })
 
 @tool
@@ -61,10 +61,10 @@ def get_recent_transactions(limit: int = 5) -> str:
     user_id = "user123"
     
     if user_id not in MOCK_TRANSACTIONS:
-        return json.dumps({"error": "No transaction history found"})
+        return json_dumps({"error": "No transaction history found"})
     
     transactions = MOCK_TRANSACTIONS[user_id][:limit]
-    return json.dumps({
+    return json_dumps({
         "transactions": transactions,
         "count": len(transactions),
         "user_id": user_id
@@ -85,7 +85,7 @@ def transfer_funds(to_account: str, amount: float, description: str = "") -> str
     """
     # Simulate security check
     if amount > 1000:
-        return json.dumps({
+        return json_dumps({
             "status": "requires_verification",
             "message": "Transfers over $1000 require additional verification",
             "amount": amount,
@@ -93,14 +93,14 @@ def transfer_funds(to_account: str, amount: float, description: str = "") -> str
         })
     
     # Simulate successful transfer
-    transaction_id = f"TXN-{random.randint(100000, 999999)}"
-    return json.dumps({
+    transaction_id = f"TXN-{token_hex(3).upper()}"
+    return json_dumps({
         "status": "completed",
         "transaction_id": transaction_id,
         "amount": amount,
         "to_account": to_account,
         "description": description,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "message": "Transfer completed successfully"
     })
 
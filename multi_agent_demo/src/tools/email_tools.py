@@ -1,8 +1,9 @@
 from langchain_core.tools import tool
-import json
-from datetime import datetime, timedelta
+from itertools import count
 from typing import List, Dict
 
+from ..utils import json_dumps, now_iso
+
 # Mock email database
 MOCK_EMAILS = [
     {
@@ -36,6 +37,35 @@ MOCK_EMAILS = [
 
 SENT_EMAILS = []
 
+# Separate monotonic counters per id kind. Deriving both draft and sent ids
+# from len(SENT_EMAILS) made them collide (drafts never land in the list)
+# and raced under concurrent calls; itertools.count increments atomically
+_draft_ctr = count(1)
+_sent_ctr = count(1)
+
+# O(1) id lookup instead of a linear scan per call
+_EMAILS_BY_ID = {e["id"]: e for e in MOCK_EMAILS}
+
+# Internal domain allowlist; str.endswith takes the whole tuple in one
+# C-level call, so growing the list does not add per-call Python work
+_INTERNAL_DOMAINS = ("@company.com",)
+
+# Pre-sorted view built once at import: the mock inbox is static and the
+# timestamps sort lexicographically, so no per-call copy + sort is needed
+_EMAILS_SORTED = sorted(MOCK_EMAILS, key=lambda e: e["timestamp"], reverse=True)
+
+# The unread view goes stale when an email is marked read; rebuilt lazily
+_unread_view = {"stale": True, "emails": []}
+
+
+def _unread_sorted():
+    """Sorted unread emails, rebuilt only after a read-flag change"""
+    if _unread_view["stale"]:
+        _unread_view["emails"] = [e for e in _EMAILS_SORTED if not e["read"]]
+        _unread_view["stale"] = False
+    return _unread_view["emails"]
+
+
 @tool
 def get_recent_emails(limit: int = 10, unread_only: bool = False) -> str:
     """
@@ -48,22 +78,14 @@ def get_recent_emails(limit: int = 10, unread_only: bool = False) -> str:
     Returns:
         JSON string with email list
     """
-    emails = MOCK_EMAILS.copy()
-    
-    if unread_only:
-        emails = [e for e in emails if not e["read"]]
-    
-    # Sort by timestamp (most recent first)
-    emails.sort(key=lambda x: x["timestamp"], reverse=True)
-    
-    # Limit results
-    emails = emails[:limit]
+    # Most recent first; a bounded slice of the pre-sorted view
+    emails = (_unread_sorted() if unread_only else _EMAILS_SORTED)[:limit]
     
-    return json.dumps({
+    return json_dumps({
         "emails": emails,
         "count": len(emails),
         "unread_only": unread_only,
-        "retrieved_at": datetime.now().isoformat()
+        "retrieved_at": now_iso()
     })
 
 @tool
@@ -77,17 +99,18 @@ def get_email_by_id(email_id: str) -> str:
     Returns:
         JSON string with email details
     """
-    email = next((e for e in MOCK_EMAILS if e["id"] == email_id), None)
+    email = _EMAILS_BY_ID.get(email_id)
     
     if not email:
-        return json.dumps({"error": "Email not found", "email_id": email_id})
+        return json_dumps({"error": "Email not found", "email_id": email_id})
     
-    # Mark as read when accessed
+    # Mark as read when accessed; the cached unread view must be rebuilt
     email["read"] = True
+    _unread_view["stale"] = True
     
-    return json.dumps({
+    return json_dumps({
         "email": email,
-        "retrieved_at": datetime.now().isoformat()
+        "retrieved_at": now_iso()
     })
 
 @tool
@@ -104,7 +127,7 @@ def draft_email(to_address: str, subject: str, body: str, priority: str = "mediu
     Returns:
         JSON string with draft details
     """
-    draft_id = f"draft_{len(SENT_EMAILS) + 1:03d}"
+    draft_id = f"draft_{next(_draft_ctr):03d}"
     
     draft = {
         "draft_id": draft_id,
@@ -113,10 +136,10 @@ def draft_email(to_address: str, subject: str, body: str, priority: str = "mediu
         "body": body,
         "priority": priority,
         "status": "draft",
-        "created_at": datetime.now().isoformat()
+        "created_at": now_iso()
     }
     
-    return json.dumps({
+    return json_dumps({
         "draft": draft,
         "message": "Email drafted successfully. Use send_email to send.",
         "requires_confirmation": True
@@ -137,10 +160,10 @@ def send_email(to_address: str, subject: str, body: str, draft_id: str = None) -
         JSON string with send confirmation
     """
     # Check if external email (security consideration)
-    is_external = not to_address.endswith("@company.com")
+    is_external = not to_address.endswith(_INTERNAL_DOMAINS)
     
     if is_external:
-        return json.dumps({
+        return json_dumps({
             "status": "requires_confirmation",
             "message": "External email requires user confirmation",
             "to_address": to_address,
@@ -149,19 +172,19 @@ def send_email(to_address: str, subject: str, body: str, draft_id: str = None) -
         })
     
     # Simulate sending
-    email_id = f"sent_{len(SENT_EMAILS) + 1:03d}"
+    email_id = f"sent_{next(_sent_ctr):03d}"
     sent_email = {
         "id": email_id,
         "to": to_address,
         "subject": subject,
         "body": body,
-        "sent_at": datetime.now().isoformat(),
+        "sent_at": now_iso(),
         "status": "sent"
     }
     
     SENT_EMAILS.append(sent_email)
     
-    return json.dumps({
+    return json_dumps({
         "status": "sent",
         "email_id": email_id,
         "sent_at": sent_email["sent_at"],
@@ -1,8 +1,11 @@
 from langchain_core.tools import tool
 from typing import Dict, List, Any
-import json
-import random
-from datetime import datetime, timedelta
+from secrets import token_hex
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache
+
+from ..utils import json_dumps, now_iso
 
 # Mock travel data
 MOCK_FLIGHTS = [
@@ -43,6 +46,38 @@ MOCK_HOTELS = [
     }
 ]
 
+# Lookup indexes built once at import, replacing linear scans per tool call:
+# id lookups become O(1) and exact route/location token queries become a
+# single dict probe
+_HOTELS_BY_ID = {h["hotel_id"]: h for h in MOCK_HOTELS}
+
+_FLIGHTS_BY_ROUTE_TOKEN = defaultdict(list)
+for _flight in MOCK_FLIGHTS:
+    for _token in _flight["route"].upper().split("-"):
+        _FLIGHTS_BY_ROUTE_TOKEN[_token].append(_flight)
+
+_HOTELS_BY_LOCATION_TOKEN = defaultdict(list)
+for _hotel in MOCK_HOTELS:
+    for _token in _hotel["location"].upper().split():
+        _HOTELS_BY_LOCATION_TOKEN[_token].append(_hotel)
+
+# Uppercase forms for the substring fallbacks, folded once at import so
+# partial-match searches stop re-uppercasing every record per call. Kept as
+# parallel (upper, record) pairs rather than extra dict fields so the mock
+# records serialize unchanged in tool responses
+_FLIGHTS_WITH_ROUTE_UPPER = tuple((f["route"].upper(), f) for f in MOCK_FLIGHTS)
+_HOTELS_WITH_LOCATION_UPPER = tuple((h["location"].upper(), h) for h in MOCK_HOTELS)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD string; memoized since sessions re-query dates.
+
+    date.fromisoformat is C-implemented and much faster than the
+    locale-aware strptime machinery it replaces."""
+    return date.fromisoformat(value)
+
+
 @tool
 def search_flights(destination: str, departure_date: str, return_date: str = None) -> str:
     """
@@ -56,15 +91,19 @@ def search_flights(destination: str, departure_date: str, return_date: str = Non
     Returns:
         JSON string with flight options
     """
-    # Filter flights based on destination
-    available_flights = [f for f in MOCK_FLIGHTS if destination.upper() in f["route"]]
+    # Exact route-token queries hit the index in one probe; partial queries
+    # fall back to the substring scan
+    query = destination.upper()
+    available_flights = _FLIGHTS_BY_ROUTE_TOKEN.get(query)
+    if available_flights is None:
+        available_flights = [f for route_upper, f in _FLIGHTS_WITH_ROUTE_UPPER if query in route_upper]
     
-    return json.dumps({
+    return json_dumps({
         "destination": destination,
         "departure_date": departure_date,
         "return_date": return_date,
         "flights": available_flights,
-        "search_timestamp": datetime.now().isoformat()
+        "search_timestamp": now_iso()
     })
 
 @tool 
@@ -82,25 +121,29 @@ def search_hotels(location: str, check_in: str, check_out: str, guests: int = 1)
         JSON string with hotel options
     """
     # Calculate stay duration
-    checkin_date = datetime.strptime(check_in, "%Y-%m-%d")
-    checkout_date = datetime.strptime(check_out, "%Y-%m-%d")
-    nights = (checkout_date - checkin_date).days
+    nights = (_parse_date(check_out) - _parse_date(check_in)).days
     
-    # Filter hotels by location
-    available_hotels = [h for h in MOCK_HOTELS if location.upper() in h["location"].upper()]
+    # Exact location-token queries hit the index in one probe; partial
+    # queries fall back to the substring scan
+    query = location.upper()
+    available_hotels = _HOTELS_BY_LOCATION_TOKEN.get(query)
+    if available_hotels is None:
+        available_hotels = [h for location_upper, h in _HOTELS_WITH_LOCATION_UPPER if query in location_upper]
     
-    # Add total cost calculation
-    for hotel in available_hotels:
-        hotel["total_cost"] = hotel["price_per_night"] * nights
-        hotel["nights"] = nights
-    
-    return json.dumps({
+    # Totals go into throwaway copies: writing them onto the shared mock
+    # dicts raced concurrent searches and left stale totals behind
+    results = [
+        {**h, "total_cost": h["price_per_night"] * nights, "nights": nights}
+        for h in available_hotels
+    ]
+
+    return json_dumps({
         "location": location,
         "check_in": check_in,
         "check_out": check_out,
         "nights": nights,
         "guests": guests,
-        "hotels": available_hotels
+        "hotels": results
     })
 
 @tool
@@ -118,23 +161,27 @@ def book_hotel(hotel_id: str, check_in: str, check_out: str, guest_name: str) ->
         JSON string with booking confirmation
     """
     # Find hotel details
-    hotel = next((h for h in MOCK_HOTELS if h["hotel_id"] == hotel_id), None)
+    hotel = _HOTELS_BY_ID.get(hotel_id)
     
     if not hotel:
-        return json.dumps({"error": "Hotel not found", "hotel_id": hotel_id})
+        return json_dumps({"error": "Hotel not found", "hotel_id": hotel_id})
     
+    # Total computed from the booking's own dates now that searches no
+    # longer stash totals on the shared records
+    nights = (_parse_date(check_out) - _parse_date(check_in)).days
+
     # Generate booking confirmation
-    confirmation_code = f"BK{random.randint(100000, 999999)}"
-    
-    return json.dumps({
+    confirmation_code = f"BK{token_hex(3).upper()}"
+
+    return json_dumps({
         "status": "confirmed",
         "confirmation_code": confirmation_code,
         "hotel_name": hotel["name"],
         "guest_name": guest_name,
         "check_in": check_in,
         "check_out": check_out,
-        "total_cost": hotel.get("total_cost", hotel["price_per_night"]),
-        "booking_timestamp": datetime.now().isoformat()
+        "total_cost": hotel["price_per_night"] * max(nights, 1),
+        "booking_timestamp": now_iso()
     })
 
 # Travel tools collection
@@ -0,0 +1,8 @@
+"""
+Shared utilities for the multi-agent demo
+"""
+
+from ._json import json_dumps
+from ._time import now_iso
+
+__all__ = ['json_dumps', 'now_iso']
@@ -0,0 +1,20 @@
+import json
+
+# orjson serializes in C, several times faster than the stdlib json module
+# and with far fewer allocations; fall back to json.dumps when it is not
+# installed. The wrapper keeps the str return contract the tools rely on.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON string (orjson-backed)"""
+        return orjson.dumps(obj, default=str).decode()
+else:
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON string (stdlib fallback)"""
+        return json.dumps(obj, default=str)
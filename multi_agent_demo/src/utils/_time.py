@@ -0,0 +1,19 @@
+import threading
+import time
+from datetime import datetime
+
+# Tool handlers stamp several timestamp fields per call, and each
+# datetime.now().isoformat() pays a clock read plus string formatting.
+# Memoize the rendered string within a 1 ms window; thread-local so
+# concurrent scenario runs never share a cache slot.
+_local = threading.local()
+
+
+def now_iso() -> str:
+    """ISO-8601 wall-clock timestamp, cached within a 1 ms window"""
+    t = time.time()
+    cached = getattr(_local, "cached", None)
+    if cached is None or t - cached[0] > 0.001:
+        cached = (t, datetime.fromtimestamp(t).isoformat())
+        _local.cached = cached
+    return cached[1]
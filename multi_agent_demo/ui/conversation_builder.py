@@ -6,6 +6,50 @@ import streamlit as st
 import json
 from datetime import datetime
 
+# Messages painted by default; older ones sit in an expander so long
+# conversations stop re-rendering their full history on every rerun
+VISIBLE_MESSAGE_WINDOW = 20
+
+# Pasted dumps can be arbitrarily large; content past these sizes renders
+# as a short preview with the full text behind an expander so a single
+# huge message can't stall the page
+CONTENT_COLLAPSE_THRESHOLD = 4000
+CONTENT_PREVIEW_CHARS = 1500
+ACTION_INPUT_COLLAPSE_THRESHOLD = 2000
+
+
+def _render_text_content(content: str, allow_expander: bool = True):
+    """Render message text, collapsing oversized content behind an expander.
+
+    Messages drawn inside the earlier-messages expander pass
+    allow_expander=False and get a preview only: Streamlit raises on
+    expanders nested inside expanders."""
+    # st.text() doesn't interpret markdown, so even the preview stays cheap
+    if len(content) > CONTENT_COLLAPSE_THRESHOLD:
+        st.text(content[:CONTENT_PREVIEW_CHARS] + "…")
+        if allow_expander:
+            with st.expander(f"Show full content ({len(content):,} chars)"):
+                st.text(content)
+        else:
+            st.caption(f"Showing first {CONTENT_PREVIEW_CHARS:,} of {len(content):,} chars")
+    else:
+        st.text(content)
+
+
+def _render_action_input(action_input: dict, allow_expander: bool = True):
+    """Render action parameters, collapsing oversized JSON behind an expander"""
+    serialized = json.dumps(action_input, ensure_ascii=False)
+    if len(serialized) > ACTION_INPUT_COLLAPSE_THRESHOLD:
+        if allow_expander:
+            with st.expander(f"Show parameters ({len(serialized):,} chars)"):
+                st.json(action_input)
+        else:
+            # Inside the history expander: preview only, see _render_text_content
+            st.text(serialized[:ACTION_INPUT_COLLAPSE_THRESHOLD] + "…")
+            st.caption(f"Showing first {ACTION_INPUT_COLLAPSE_THRESHOLD:,} of {len(serialized):,} chars")
+    else:
+        st.json(action_input)
+
 
 def render_conversation_builder():
     """Render the conversation builder UI"""
@@ -24,14 +68,20 @@ def render_conversation_builder():
     st.divider()
     st.subheader("💬 Conversation Builder")
 
-    # Display current conversation
-    for i, msg in enumerate(st.session_state.current_conversation["messages"]):
-        if st.session_state.editing_message_index == i:
-            # Editing mode for this message
-            _render_message_editor(i, msg)
-        else:
-            # Normal display mode with edit/delete buttons
-            _render_message_display(i, msg)
+    # Display current conversation: only the last VISIBLE_MESSAGE_WINDOW
+    # messages render directly; earlier history loads on demand
+    messages = st.session_state.current_conversation["messages"]
+    hidden_count = len(messages) - VISIBLE_MESSAGE_WINDOW
+    if hidden_count > 0:
+        with st.expander(f"Show {hidden_count} earlier message(s)"):
+            for i in range(hidden_count):
+                _render_message(i, messages[i], allow_expander=False)
+        visible_start = hidden_count
+    else:
+        visible_start = 0
+
+    for i in range(visible_start, len(messages)):
+        _render_message(i, messages[i])
 
     # Add new message
     _render_message_adder()
@@ -40,6 +90,16 @@ def render_conversation_builder():
     _render_control_buttons()
 
 
+def _render_message(index: int, msg: dict, allow_expander: bool = True):
+    """Render one message in editing or display mode"""
+    if st.session_state.editing_message_index == index:
+        # Editing mode for this message
+        _render_message_editor(index, msg)
+    else:
+        # Normal display mode with edit/delete buttons
+        _render_message_display(index, msg, allow_expander)
+
+
 def _render_message_editor(index: int, msg: dict):
     """Render message editor UI"""
     with st.container():
@@ -118,14 +178,13 @@ def _render_message_editor(index: int, msg: dict):
                         st.rerun()
 
 
-def _render_message_display(index: int, msg: dict):
+def _render_message_display(index: int, msg: dict, allow_expander: bool = True):
     """Render message display with edit/delete buttons"""
     if msg["type"] == "user":
         with st.chat_message("user"):
             col_msg, col_btns = st.columns([4, 1])
             with col_msg:
-                # Use st.text() which doesn't interpret markdown at all
-                st.text(msg["content"])
+                _render_text_content(msg["content"], allow_expander)
             with col_btns:
                 btn_col1, btn_col2 = st.columns(2)
                 with btn_col1:
@@ -143,12 +202,11 @@ def _render_message_display(index: int, msg: dict):
                 if msg.get("action"):
                     st.write(f"**Action:** `{msg['action']}`")
                     st.write("**Thought:**")
-                    st.text(msg["content"])
+                    _render_text_content(msg["content"], allow_expander)
                     if msg.get("action_input"):
-                        st.json(msg["action_input"])
+                        _render_action_input(msg["action_input"], allow_expander)
                 else:
-                    # Use st.text() which doesn't interpret markdown at all
-                    st.text(msg["content"])
+                    _render_text_content(msg["content"], allow_expander)
             with col_btns:
                 btn_col1, btn_col2 = st.columns(2)
                 with btn_col1:
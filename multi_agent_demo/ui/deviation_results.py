@@ -4,7 +4,6 @@ Clean, focused visualization of deviation and bias detection results
 """
 
 import streamlit as st
-import pandas as pd
 from typing import List, Dict, Any
 
 
@@ -98,6 +97,9 @@ def _render_simple_bias_card(bias: Dict[str, Any]):
 
 def _render_simple_deviation_card(deviation: Dict[str, Any]):
     """Render a simplified deviation finding card"""
+    # Imported here so the ui package doesn't pull pandas in at cold start
+    import pandas as pd
+
     with st.container():
         # Main description
         st.markdown(f"**{deviation['description']}**")
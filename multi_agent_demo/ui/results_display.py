@@ -3,9 +3,11 @@ Test results display UI components
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
+
+# pandas and plotly are imported inside the functions that draw charts:
+# this module loads on every cold start via the ui package, but the charts
+# only exist once a test has run, so importing the heavy libraries at the
+# top would charge every startup for them
 
 
 def _render_result_summary(result: dict):
@@ -97,6 +99,8 @@ def render_test_results():
 
 def _render_alignment_check_results(result: dict):
     """Render AlignmentCheck scanner results"""
+    import plotly.graph_objects as go
+
     st.subheader("AlignmentCheck Scanner")
     ac_result = result["alignment_check"]
 
@@ -160,34 +164,54 @@ def _render_alignment_check_results(result: dict):
 
 def _render_prompt_guard_results(result: dict):
     """Render PromptGuard scanner results"""
+    import pandas as pd
+
     st.subheader("PromptGuard Scanner")
     if result["prompt_guard"]:
-        for pg_result in result["prompt_guard"]:
-            if "error" not in pg_result:
-                if pg_result["is_safe"]:
-                    st.success(f"✅ Safe: {pg_result['message']}")
-                else:
-                    # Show the reason (what was detected) instead of just the message
-                    reason = pg_result.get('reason', 'Prompt injection detected')
-                    st.error(f"🚫 Blocked: {reason}")
-                    # Show the truncated message as additional context
-                    st.caption(f"Input: {pg_result['message']}")
-                st.caption(f"Score: {pg_result.get('score', 'N/A')} | Decision: {pg_result.get('decision', 'N/A')}")
+        scanned = [pg for pg in result["prompt_guard"] if "error" not in pg]
+        errors = [pg for pg in result["prompt_guard"] if "error" in pg]
+
+        # One table for all verdicts instead of a success/error component
+        # per message: batch scans of long conversations were paying an
+        # O(N) front-end component cost for mostly-safe rows
+        if scanned:
+            df = pd.DataFrame([
+                {
+                    "Verdict": "✅ Safe" if pg["is_safe"] else "🚫 Blocked",
+                    "Input": pg["message"],
+                    "Score": pg.get("score", "N/A"),
+                    "Decision": pg.get("decision", "N/A")
+                }
+                for pg in scanned
+            ])
+            st.dataframe(df, hide_index=True, use_container_width=True)
+
+        # Detailed rendering only for flagged messages
+        for pg_result in scanned:
+            if not pg_result["is_safe"]:
+                # Show the reason (what was detected) instead of just the message
+                reason = pg_result.get('reason', 'Prompt injection detected')
+                st.error(f"🚫 Blocked: {reason}")
+                # Show the truncated message as additional context
+                st.caption(f"Input: {pg_result['message']}")
+
+        for pg_result in errors:
+            # Check if this is a Streamlit Cloud compatibility issue
+            if "streamlit_cloud_note" in pg_result:
+                st.error(f"⚠️ **Streamlit Cloud Compatibility Issue**")
+                st.warning("PromptGuard scanner uses models that may not be compatible with Streamlit Cloud's environment. This scanner works on local deployments.")
+                with st.expander("🔍 Technical Details"):
+                    st.code(pg_result['error'])
             else:
-                # Check if this is a Streamlit Cloud compatibility issue
-                if "streamlit_cloud_note" in pg_result:
-                    st.error(f"⚠️ **Streamlit Cloud Compatibility Issue**")
-                    st.warning("PromptGuard scanner uses models that may not be compatible with Streamlit Cloud's environment. This scanner works on local deployments.")
-                    with st.expander("🔍 Technical Details"):
-                        st.code(pg_result['error'])
-                else:
-                    st.error(f"Error: {pg_result['error']}")
+                st.error(f"Error: {pg_result['error']}")
     else:
         st.info("🔒 No user messages to scan with PromptGuard")
 
 
 def _render_nemo_results(result: dict):
     """Render NeMo GuardRails scanner results"""
+    import plotly.graph_objects as go
+
     nemo_results = result.get("nemo_results", {})
     if nemo_results:
         for scanner_name, scanner_result in nemo_results.items():
@@ -257,9 +281,16 @@ def _render_nemo_results(result: dict):
                             st.divider()
                             st.markdown("**PII Occurrences by Message:**")
 
-                            for idx, finding in enumerate(pii_findings, 1):
-                                pii_list = ', '.join([f"{e['type']}" for e in finding['pii_entities']])
-                                st.write(f"{idx}. **{finding['message_type'].capitalize()}** message: {pii_list}")
+                            # One markdown call for the whole list: each
+                            # st.write is a separate component roundtrip
+                            # and front-end render, so long finding lists
+                            # pay N of them for static text
+                            occurrence_lines = [
+                                f"{idx}. **{finding['message_type'].capitalize()}** message: "
+                                + ', '.join(e['type'] for e in finding['pii_entities'])
+                                for idx, finding in enumerate(pii_findings, 1)
+                            ]
+                            st.markdown("\n".join(occurrence_lines))
 
                 # Add expandable section for full AI response (for NeMo scanners)
                 if "ai_response" in scanner_result and scanner_result["ai_response"]:
@@ -272,6 +303,9 @@ def _render_nemo_results(result: dict):
 def _render_history_chart():
     """Render test history chart"""
     if len(st.session_state.test_results) > 1:
+        import pandas as pd
+        import plotly.express as px
+
         st.subheader("📊 Test History")
 
         history_data = []